@@ -0,0 +1,16 @@
+"""
+Default and valid analysis parameters
+
+This module has no dependencies so that the parameters can be shared by the analysis
+functions and the CLI without importing NumPy or SciPy.
+"""
+
+# --- Constants
+
+# Data correction parameters
+_VALID_INTENSITY_SCALES = ["count", "sqrt", "log"]
+
+# Peak detection parameters
+_MIN_INTENSITY_QUANTILE = 0.75
+_MIN_PEAK_WIDTH_TWO_THETA = 0.015
+_MIN_PROMINENCE_QUANTILE = 0.25
@@ -5,21 +5,43 @@ Diffractogram analysis functions
 # --- Imports
 
 # Standard library
+import concurrent.futures
+import functools
 import math
-from typing import Optional
+from typing import Iterable, Optional
 
 # External packages
-from BaselineRemoval import BaselineRemoval
 import numpy as np
+import numpy.typing as npt
 import scipy
 
+# Local package
+from pxrd_tools._defaults import (
+    _MIN_INTENSITY_QUANTILE,
+    _MIN_PEAK_WIDTH_TWO_THETA,
+    _MIN_PROMINENCE_QUANTILE,
+    _VALID_INTENSITY_SCALES,
+)
+
 
 # --- Functions
 
 # Data correction parameters
+_VALID_DTYPES = ["float32", "float64"]
+_SAVGOL_FFT_MIN_WINDOW_SIZE = 128
+_SAVGOL_FFT_MIN_SIGNAL_SIZE = 10000
 _DEFAULT_FILTER_ORDER = 3
 _DEFAULT_FILTER_WINDOW_SIZE_TWO_THETA = 0.2
 _DEFAULT_ZHANG_FIT_REPETITIONS = 15
+_DEFAULT_ZHANG_FIT_LAMBDA = 100
+
+# 2-theta spacing checks. Note: 2-theta values are compared against a uniform grid with
+# the mean 2-theta spacing. The tolerance (relative to the mean spacing) allows for
+# 2-theta values that were rounded to a resolution of up to half the spacing when they
+# were written to data files (rounding changes each value by at most half of the
+# resolution).
+_TWO_THETA_SPACING_NUM_SAMPLES = 33
+_TWO_THETA_SPACING_RTOL = 0.25
 
 
 def apply_diffractogram_corrections(
@@ -28,11 +50,14 @@ def apply_diffractogram_corrections(
     filter_order: int = _DEFAULT_FILTER_ORDER,
     filter_window_size: Optional[int] = None,
     zhang_fit_repetitions: int = _DEFAULT_ZHANG_FIT_REPETITIONS,
+    intensity_scale: str = "count",
+    dtype: npt.DTypeLike = np.float64,
 ) -> np.ndarray:
     """
     Apply corrections to diffractogram data.
 
     `apply_diffractogram_corrections()` performs the following corrections.
+      * (Optional) Rescaling of the intensity.
       * Noise removal using the Savitzky-Golay filter.
       * Baseline correction using the algorithm developed by Zhang, Chen, and Liang (2010).
 
@@ -45,40 +70,51 @@ def apply_diffractogram_corrections(
     `filter_order`: order of the polynomial to use for the Savitzky-Golay filter
 
     `filter_window_size`: width of the window to use for the Savitzky-Golay filter. By
-        default, the window size is set to $\\lceil 0.2 / \\Delta(2\\theta) \\rceil$,
-        where $\\Delta(2\\theta)$ is the spacing $2\\theta$ values in `two_theta`. This
-        choice yields a filter window that covers $0.2$ units of $2 \\theta$ (regardless
-        of the grid spacing in `two_theta`).
+        default, the window size is set to $\\lceil 0.2 / \\Delta(2\\theta) \\rceil$
+        (rounded up to the nearest odd integer), where $\\Delta(2\\theta)$ is the spacing
+        $2\\theta$ values in `two_theta`. This choice yields a filter window that is
+        centered on each data point and covers $0.2$ units of $2 \\theta$ (regardless
+        of the grid spacing in `two_theta`). For short diffractograms, the default
+        window size is capped at the largest odd integer that does not exceed the size
+        of `intensity`.
 
     `zhang_fit_repetitions`: number of iterations to use for the baseline removal algorithm
         developed by Zhang, Chen, and Liang (2010).
 
+    `intensity_scale`: scale to apply to the intensity before the other corrections.
+        Valid values: "count" (no rescaling), "sqrt" ($\\sqrt{I}$), and "log"
+        ($\\log(1 + I)$).
+
+    `dtype`: floating-point type to use for the corrections. Valid values: `np.float32`
+        and `np.float64`. Using `np.float32` reduces memory traffic (which speeds up
+        corrections for long diffractograms) at the cost of precision.
+
     Return Value
     ------------
-    corrected intensity
+    corrected intensity (with data type `dtype`)
 
     Notes
     -----
     * The spacing between intensity values is assumed to be uniform in $2 \\theta$.
+
+    * The Savitzky-Golay filter is applied as a convolution with precomputed filter
+      coefficients. Intensity values near the ends of the diffractogram are smoothed
+      using the polynomial fit to the first (or last) window of data, which matches the
+      "interp" mode of `scipy.signal.savgol_filter()`.
     """
     # --- Check arguments
     #
     # Notes
     # -----
-    # * Savitzky-Golay filter parameters are checked by scipy.signal.savgol_filter()
+    # * The Savitzky-Golay filter order is checked against the window size by
+    #   scipy.signal.savgol_coeffs()
 
     # ------ Perform two_theta and intensity checks
 
-    # Ensure that two_theta is a NumPy array
-    if not isinstance(two_theta, np.ndarray):
-        two_theta = np.array(two_theta)
-
-    # Ensure that intensity is a NumPy array
-    if not isinstance(intensity, np.ndarray):
-        intensity = np.array(intensity)
-
-    # Validate two_theta and intensity arguments
-    _validate_two_theta_and_intensity_args(two_theta, intensity)
+    # Convert two_theta and intensity to NumPy arrays and validate them
+    two_theta, intensity, delta_two_theta = _validate_two_theta_and_intensity_args(
+        two_theta, intensity
+    )
 
     # ------ Data correction parameter checks
 
@@ -89,41 +125,126 @@ def apply_diffractogram_corrections(
     # If needed, set default Savitky-Golay filter window size
     if filter_window_size is None:
         filter_window_size = math.ceil(
-            _DEFAULT_FILTER_WINDOW_SIZE_TWO_THETA / (two_theta[1] - two_theta[0])
+            _DEFAULT_FILTER_WINDOW_SIZE_TWO_THETA / delta_two_theta
         )
 
+        # Ensure that the window size is odd so that the filter window is centered on
+        # each data point
+        if filter_window_size % 2 == 0:
+            filter_window_size += 1
+
+        # Ensure that the filter window fits within the data. Note: the largest odd
+        # integer less than or equal to the size of the data is used.
+        if filter_window_size > intensity.size:
+            filter_window_size = intensity.size - (1 - intensity.size % 2)
+
     # Check that the Savitky-Golay filter window size is positive
     if filter_window_size is not None and filter_window_size <= 0:
         raise ValueError("'filter_window_size' should be positive")
 
+    # Check that the Savitky-Golay filter window fits within the data
+    if filter_window_size > intensity.size:
+        raise ValueError(
+            "'filter_window_size' should be less than or equal to the size of "
+            "'intensity'"
+        )
+
     # Check that the number of Zhang filter repetitions is positive
     if zhang_fit_repetitions <= 0:
         raise ValueError("'zhang_fit_repetitions' should be positive")
 
+    # ------ Other argument checks
+
+    # intensity_scale
+    if intensity_scale not in _VALID_INTENSITY_SCALES:
+        raise ValueError(
+            f"Invalid 'intensity_scale' value: {intensity_scale}. "
+            f"Valid values: {_VALID_INTENSITY_SCALES}."
+        )
+
+    # dtype. Note: dtype is checked before it is converted to a NumPy data type because
+    # np.dtype() raises a TypeError for invalid values.
+    if not any(np.dtype(valid_dtype) == dtype for valid_dtype in _VALID_DTYPES):
+        raise ValueError(
+            f"Invalid 'dtype' value: {getattr(dtype, '__name__', dtype)}. "
+            f"Valid values: {_VALID_DTYPES}."
+        )
+
+    dtype = np.dtype(dtype)
+
     # --- Preparations
 
-    # Initialize corrected intensity
-    corrected_intensity = np.copy(intensity)
+    # Initialize corrected intensity by rescaling the intensity
+    corrected_intensity = _rescale_intensity(intensity, intensity_scale, dtype)
 
     # --- Apply data correction
 
     # Apply Savitzky-Golay filter to remove high frequency noise
-    corrected_intensity = scipy.signal.savgol_filter(
+    corrected_intensity = _savgol_filter(
         corrected_intensity, filter_window_size, filter_order
     )
 
     # Remove baseline
-    corrected_intensity = BaselineRemoval(corrected_intensity).ZhangFit(
-        repitition=zhang_fit_repetitions
-    )
+    corrected_intensity -= _zhang_fit(corrected_intensity, zhang_fit_repetitions)
 
     return corrected_intensity
 
 
-# Peak detection parameters
-_MIN_INTENSITY_QUANTILE = 0.75
-_MIN_PEAK_WIDTH_TWO_THETA = 0.015
-_MIN_PROMINENCE_QUANTILE = 0.25
+def apply_diffractogram_corrections_batch(
+    diffractograms: Iterable[tuple[np.ndarray, np.ndarray]],
+    filter_order: int = _DEFAULT_FILTER_ORDER,
+    filter_window_size: Optional[int] = None,
+    zhang_fit_repetitions: int = _DEFAULT_ZHANG_FIT_REPETITIONS,
+    intensity_scale: str = "count",
+    dtype: npt.DTypeLike = np.float64,
+    max_workers: Optional[int] = None,
+) -> list[np.ndarray]:
+    """
+    Apply corrections to multiple diffractograms in parallel.
+
+    Each diffractogram is corrected by `apply_diffractogram_corrections()` in a
+    separate worker process.
+
+    Parameters
+    ----------
+    `diffractograms`: (2-theta values, intensity values) pairs
+
+    `filter_order`: see `apply_diffractogram_corrections()`
+
+    `filter_window_size`: see `apply_diffractogram_corrections()`. When set to `None`,
+        the window size is computed separately for each diffractogram.
+
+    `zhang_fit_repetitions`: see `apply_diffractogram_corrections()`
+
+    `intensity_scale`: see `apply_diffractogram_corrections()`
+
+    `dtype`: see `apply_diffractogram_corrections()`
+
+    `max_workers`: maximum number of worker processes. By default, the number of
+        processors on the machine is used.
+
+    Return Value
+    ------------
+    list of corrected intensities (in the same order as `diffractograms`)
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                apply_diffractogram_corrections,
+                two_theta,
+                intensity,
+                filter_order=filter_order,
+                filter_window_size=filter_window_size,
+                zhang_fit_repetitions=zhang_fit_repetitions,
+                intensity_scale=intensity_scale,
+                dtype=dtype,
+            )
+            for two_theta, intensity in diffractograms
+        ]
+
+        corrected_intensities = [future.result() for future in futures]
+
+    return corrected_intensities
 
 
 def find_peaks(
@@ -168,16 +289,10 @@ def find_peaks(
 
     # ------ Perform two_theta and intensity checks
 
-    # Ensure that two_theta is a NumPy array
-    if not isinstance(two_theta, np.ndarray):
-        two_theta = np.array(two_theta)
-
-    # Ensure that intensity is a NumPy array
-    if not isinstance(intensity, np.ndarray):
-        intensity = np.array(intensity)
-
-    # Validate two_theta and intensity arguments
-    _validate_two_theta_and_intensity_args(two_theta, intensity)
+    # Convert two_theta and intensity to NumPy arrays and validate them
+    two_theta, intensity, delta_two_theta = _validate_two_theta_and_intensity_args(
+        two_theta, intensity
+    )
 
     # ------ Peak detection parameter checks
 
@@ -201,57 +316,45 @@ def find_peaks(
             "'min_prominence_quantile' should lie in the interval [0, 1]."
         )
 
-    # ------ Other argument checks
-
-    # Check that two_theta and intensity have the same shape
-    if intensity.size != two_theta.size:
-        raise ValueError("'two_theta' and 'intensity' should be the same size")
-
     # --- Preparations
 
-    # Compute spacing of 2-theta values
-    delta_two_theta = two_theta[1] - two_theta[0]
+    # Compute minimum peak width in units of array indices
     min_index_width = min_width / delta_two_theta
 
     # ------ Compute minimum intensity to use for finding peaks
+    #
+    # Note: the minimum intensity is the larger of the mean intensity and the intensity
+    # quantile
 
-    intensity_mean = np.mean(intensity)
-
-    intensity_quantile = np.quantile(intensity, q=min_intensity_quantile)
-
-    if intensity_mean > intensity_quantile:
-        min_intensity = intensity_mean
-    else:
-        min_intensity = intensity_quantile
+    min_intensity = max(intensity.mean(), _quantile(intensity, min_intensity_quantile))
 
     # --- Find peaks
 
-    # Find peaks without prominence constraint
+    # Find peaks without prominence constraint. Note: because a width constraint is
+    # specified, scipy.signal.find_peaks() also computes the peak prominences.
     peak_indices, properties = scipy.signal.find_peaks(
         intensity, height=min_intensity, width=min_index_width
     )
 
-    # Compute peak prominences
+    # Apply prominence constraint
     if peak_indices.size > 0:
-        peak_prominences, _, _ = scipy.signal.peak_prominences(intensity, peak_indices)
+        peak_prominences = properties["prominences"]
 
         # Compute minimim peak prominence
-        min_prominence = np.quantile(peak_prominences, q=min_prominence_quantile)
+        min_prominence = _quantile(peak_prominences, min_prominence_quantile)
 
-        # Find peaks with height and prominence constraints
-        peak_indices, properties = scipy.signal.find_peaks(
-            intensity,
-            height=min_intensity,
-            width=min_index_width,
-            prominence=min_prominence,
-        )
+        # Remove peaks with prominences below the minimum peak prominence
+        is_prominent = peak_prominences >= min_prominence
+        peak_indices = peak_indices[is_prominent]
+        properties = {key: value[is_prominent] for key, value in properties.items()}
 
     # --- Compute peak locations and widths
 
     peaks = two_theta[peak_indices]
 
-    widths, _, _, _ = scipy.signal.peak_widths(intensity, peak_indices)
-    peak_widths = delta_two_theta * widths
+    # Note: because a width constraint is specified, scipy.signal.find_peaks() also
+    # computes the peak widths (at half of the peak prominence)
+    peak_widths = delta_two_theta * properties["widths"]
 
     return peaks, peak_widths, peak_indices
 
@@ -259,38 +362,429 @@ def find_peaks(
 # --- Helper functions
 
 
+def _rescale_intensity(
+    intensity: np.ndarray, intensity_scale: str, dtype: np.dtype
+) -> np.ndarray:
+    """
+    Rescale intensity values.
+
+    Parameters
+    ----------
+    `intensity`: intensity or count values
+
+    `intensity_scale`: scale to apply to the intensity. See
+        `apply_diffractogram_corrections()` for valid values.
+
+    `dtype`: data type of the rescaled intensity
+
+    Return Value
+    ------------
+    rescaled intensity
+
+    Notes
+    -----
+    * The rescaled intensity is computed in a single pass directly into a new array of
+      type `dtype`. When no rescaling is needed, `intensity` is only copied if it is not
+      already a C-contiguous array of type `dtype`.
+    """
+    if intensity_scale == "sqrt":
+        return np.sqrt(intensity, dtype=dtype)
+
+    if intensity_scale == "log":
+        return np.log1p(intensity, dtype=dtype)
+
+    return np.ascontiguousarray(intensity, dtype=dtype)
+
+
+def _savgol_filter(intensity: np.ndarray, window_size: int, order: int) -> np.ndarray:
+    """
+    Apply a Savitzky-Golay filter to intensity data. Intensity values within half a
+    window of the ends of the data are set to the values of the polynomial fit to the
+    first (or last) window of data (consistent with the "interp" mode of
+    `scipy.signal.savgol_filter()`).
+
+    Parameters
+    ----------
+    `intensity`: intensity values
+
+    `window_size`: width of the filter window
+
+    `order`: order of the polynomial used to fit the data within the filter window
+
+    Return Value
+    ------------
+    filtered intensity (with the same data type as `intensity`)
+
+    Notes
+    -----
+    * For long signals with wide filter windows, the filter is applied using FFT-based
+      (overlap-add) convolution, which costs $O(N \\log W)$ operations instead of the
+      $O(N W)$ operations required by direct convolution.
+    """
+    coeffs = _savgol_coeffs(window_size, order).astype(intensity.dtype, copy=False)
+
+    # --- Filter intensity values away from the ends of the data
+    #
+    # Note: the values within half a window of the ends of the data are overwritten
+    # below, so the choice of padding does not affect the filtered intensity.
+
+    is_long_signal = intensity.size >= _SAVGOL_FFT_MIN_SIGNAL_SIZE
+    if window_size > _SAVGOL_FFT_MIN_WINDOW_SIZE and is_long_signal:
+        # Reflect data about the endpoints. Note: the padding is consistent with the
+        # "mirror" mode of scipy.ndimage.convolve1d() for both odd and even window
+        # sizes.
+        padded_intensity = np.pad(
+            intensity,
+            (window_size - 1 - window_size // 2, window_size // 2),
+            mode="reflect",
+        )
+        filtered_intensity = scipy.signal.oaconvolve(
+            padded_intensity, coeffs, mode="valid"
+        )
+    else:
+        filtered_intensity = scipy.ndimage.convolve1d(intensity, coeffs, mode="mirror")
+
+    # --- Filter intensity values near the ends of the data
+
+    half_window_size = window_size // 2
+    if half_window_size > 0:
+        edge_coeffs = _savgol_edge_coeffs(window_size, order).astype(
+            intensity.dtype, copy=False
+        )
+        filtered_intensity[:half_window_size] = (
+            edge_coeffs[:half_window_size] @ intensity[:window_size]
+        )
+        filtered_intensity[-half_window_size:] = (
+            edge_coeffs[-half_window_size:] @ intensity[-window_size:]
+        )
+
+    return filtered_intensity
+
+
+def _quantile(values: np.ndarray, q: float) -> float:
+    """
+    Compute the `q`-th quantile of `values`.
+
+    Parameters
+    ----------
+    `values`: 1D array of values
+
+    `q`: quantile to compute. Should lie in the interval [0, 1].
+
+    Return Value
+    ------------
+    quantile of `values`
+
+    Notes
+    -----
+    * The quantile is computed by linearly interpolating between adjacent order
+      statistics, which is the default method used by `np.quantile()`.
+
+    * At most a single `np.partition()` call is needed, so the cost is $O(N)$ without
+      the general-purpose argument handling overhead of `np.quantile()`. The extreme
+      quantiles ($q = 0$ and $q = 1$) are computed using `min()` and `max()`.
+    """
+    # Handle extreme quantiles, which do not require partitioning
+    if q == 0:
+        return values.min()
+    if q == 1:
+        return values.max()
+
+    # Compute position of quantile within sorted values
+    position = q * (values.size - 1)
+    k = int(position)
+    fraction = position - k
+
+    # Find the k-th smallest value. Note: after partitioning, all values after index
+    # k are greater than or equal to the k-th smallest value.
+    partitioned_values = np.partition(values, k)
+    lower_value = partitioned_values[k]
+    if fraction == 0:
+        return lower_value
+
+    # Interpolate between the k-th and (k+1)-th smallest values
+    upper_value = partitioned_values[k + 1 :].min()
+    return lower_value + fraction * (upper_value - lower_value)
+
+
+@functools.lru_cache(maxsize=32)
+def _savgol_coeffs(window_size: int, order: int) -> np.ndarray:
+    """
+    Compute (and cache) the convolution coefficients for a Savitzky-Golay filter.
+
+    Parameters
+    ----------
+    `window_size`: width of the filter window
+
+    `order`: order of the polynomial used to fit the data within the filter window
+
+    Return Value
+    ------------
+    read-only array of filter coefficients
+    """
+    coeffs = scipy.signal.savgol_coeffs(window_size, order)
+    coeffs.flags.writeable = False
+
+    return coeffs
+
+
+@functools.lru_cache(maxsize=32)
+def _savgol_edge_coeffs(window_size: int, order: int) -> np.ndarray:
+    """
+    Compute (and cache) the coefficients that evaluate the least-squares polynomial fit
+    to a window of data at each point in the window.
+
+    Parameters
+    ----------
+    `window_size`: width of the filter window
+
+    `order`: order of the polynomial used to fit the data within the filter window
+
+    Return Value
+    ------------
+    read-only `window_size` x `window_size` array. Row $i$ contains the coefficients
+    that evaluate the polynomial fit to the window of data at the $i$-th point in the
+    window.
+
+    Notes
+    -----
+    * The coefficients form the matrix that projects data onto the space of polynomials
+      of degree `order` (evaluated at the points in the window). The projection matrix
+      is computed from an orthonormal basis for the space (obtained from the QR
+      decomposition of a Vandermonde matrix).
+    """
+    vandermonde = np.vander(np.linspace(-1, 1, num=window_size), order + 1)
+    basis, _ = np.linalg.qr(vandermonde)
+    coeffs = basis @ basis.T
+    coeffs.flags.writeable = False
+
+    return coeffs
+
+
 def _validate_two_theta_and_intensity_args(
     two_theta: np.ndarray, intensity: np.ndarray
-) -> None:
+) -> (np.ndarray, np.ndarray, float):
     """
-    Validate `two_theta` and `intensity` arguments.
+    Convert `two_theta` and `intensity` arguments to NumPy arrays and validate them.
 
     Parameters
     ----------
     `two_theta`: 2-theta values
 
     `intensity`: intensity values
+
+    Return value
+    ------------
+    `two_theta`: 2-theta values as a float64 NumPy array
+
+    `intensity`: intensity values as a C-contiguous NumPy array. float32 and float64
+        values keep their data type. Other values are converted to float64.
+
+    `delta_two_theta`: mean spacing of 2-theta values
+
+    Notes
+    -----
+    * 2-theta values are considered to be uniformly spaced if they lie within
+      $0.25 \\Delta(2\\theta)$ of the uniform grid that has the same first and last
+      values, where $\\Delta(2\\theta)$ is the mean spacing. This tolerance accepts
+      2-theta values that have been rounded (e.g., when written to data files).
+
+    * To keep validation inexpensive for long diffractograms, uniformity of the
+      spacing of 2-theta values is checked on a sample of 2-theta values.
     """
+    # --- Convert arguments to NumPy arrays
+    #
+    # Notes
+    # -----
+    # * np.asarray() does not copy arguments that are already arrays of the requested
+    #   data type.
+    #
+    # * float32 intensity values are not converted to float64 so that single-precision
+    #   corrections (see apply_diffractogram_corrections()) do not need to make a
+    #   double-precision copy of the intensity.
+
+    two_theta = np.asarray(two_theta, dtype=np.float64)
+    intensity = np.asarray(intensity)
+    if intensity.dtype not in _VALID_DTYPES:
+        intensity = intensity.astype(np.float64)
+
     # --- two_theta
 
     # Check that two_theta is a vector
-    if len(two_theta.shape) > 1 or np.prod(two_theta.shape) != two_theta.size:
+    if two_theta.ndim != 1:
         raise ValueError("'two_theta' should be a 1D vector")
 
     # Check that two_theta is not empty
-    if len(two_theta) == 0:
+    if two_theta.size == 0:
         raise ValueError("'two_theta' should not be empty")
 
     # --- intensity
 
     # Check that intensity is a vector
-    if len(intensity.shape) > 1 or np.prod(intensity.shape) != intensity.size:
+    if intensity.ndim != 1:
         raise ValueError("'intensity' should be a 1D vector")
 
     # Check that intensity is not empty
-    if len(intensity) == 0:
+    if intensity.size == 0:
         raise ValueError("'intensity' should not be empty")
 
     # Check that two_theta and intensity have the same shape
     if intensity.size != two_theta.size:
         raise ValueError("'two_theta' and 'intensity' should be the same size")
+
+    # Ensure that intensity is stored in a contiguous block of memory. Note: the
+    # filtering, baseline, and peak-finding routines sweep through intensity
+    # sequentially, so strided views (e.g., DataFrame columns) are copied once here
+    # rather than by each routine.
+    intensity = np.ascontiguousarray(intensity)
+
+    # --- two_theta spacing
+
+    # Check that two_theta contains enough values to define a spacing
+    if two_theta.size < 2:
+        raise ValueError("'two_theta' should contain at least 2 values")
+
+    # Check that two_theta is increasing
+    delta_two_theta = (two_theta[-1] - two_theta[0]) / (two_theta.size - 1)
+    if delta_two_theta <= 0:
+        raise ValueError("'two_theta' should be increasing")
+
+    # Check that two_theta is uniformly spaced
+    sample_indices = np.linspace(
+        0, two_theta.size - 1, num=_TWO_THETA_SPACING_NUM_SAMPLES, dtype=np.intp
+    )
+    grid_deviations = np.abs(
+        two_theta[sample_indices] - (two_theta[0] + sample_indices * delta_two_theta)
+    )
+    if grid_deviations.max() > _TWO_THETA_SPACING_RTOL * delta_two_theta:
+        raise ValueError("'two_theta' should be uniformly spaced")
+
+    return two_theta, intensity, delta_two_theta
+
+
+def _zhang_fit(
+    intensity: np.ndarray,
+    repetitions: int,
+    lambda_: float = _DEFAULT_ZHANG_FIT_LAMBDA,
+) -> np.ndarray:
+    """
+    Estimate the baseline of a diffractogram using the adaptive iteratively reweighted
+    penalized least squares (airPLS) algorithm developed by Zhang, Chen, and Liang
+    (2010).
+
+    Parameters
+    ----------
+    `intensity`: intensity values
+
+    `repetitions`: maximum number of reweighting iterations
+
+    `lambda_`: smoothing parameter. Larger values yield smoother baselines.
+
+    Return Value
+    ------------
+    baseline (with the same data type as `intensity`)
+
+    Notes
+    -----
+    * The penalty term uses first-order differences, which matches the ZhangFit
+      implementation in the `BaselineRemoval` package (with `porder=1`).
+
+    * Because the penalty term uses first-order differences, the linear system solved
+      at each iteration, $(W + \\lambda D^T D) z = W y$, is symmetric, positive
+      definite, and tridiagonal. It is solved in $O(N)$ operations using a banded
+      Cholesky solver.
+
+    * The banded penalty matrix $\\lambda D^T D$ is constructed once per diffractogram
+      length (see `_zhang_fit_penalty()`). Only the diagonal weights change between
+      iterations.
+    """
+    # --- Preparations
+
+    num_points = intensity.size
+
+    # Get banded penalty matrix
+    penalty = _zhang_fit_penalty(num_points, lambda_)
+
+    # Compute convergence threshold
+    tolerance = 0.001 * np.abs(intensity).sum()
+
+    # Initialize weights
+    weights = np.ones(num_points, dtype=intensity.dtype)
+
+    # Allocate workspace. Note: the workspace arrays are reused across iterations, so
+    # each iteration does not allocate new temporary arrays.
+    system_matrix = np.empty_like(penalty, dtype=intensity.dtype)
+    rhs = np.empty_like(intensity)
+    residual = np.empty_like(intensity)
+    is_below_baseline = np.empty(num_points, dtype=bool)
+
+    # --- Estimate baseline
+
+    for i in range(1, repetitions + 1):
+        # Solve (W + lambda D^T D) z = W y for the baseline z
+        np.copyto(system_matrix, penalty)
+        system_matrix[1] += weights
+        np.multiply(weights, intensity, out=rhs)
+        baseline = scipy.linalg.solveh_banded(
+            system_matrix,
+            rhs,
+            overwrite_ab=True,
+            overwrite_b=True,
+            check_finite=False,
+        )
+
+        # Check for convergence
+        np.subtract(intensity, baseline, out=residual)
+        np.less(residual, 0, out=is_below_baseline)
+        residual_norm = -np.sum(residual, where=is_below_baseline)
+        if residual_norm < tolerance or i == repetitions:
+            break
+
+        # Update weights. Points above the baseline are considered to be part of a
+        # peak, so their weights are set to zero.
+        max_residual = np.max(residual, where=is_below_baseline, initial=-np.inf)
+        np.multiply(residual, -i, out=weights)
+        weights /= residual_norm
+        np.exp(weights, out=weights)
+        weights *= is_below_baseline
+        weights[0] = np.exp(i * max_residual / residual_norm)
+        weights[-1] = weights[0]
+
+    return baseline
+
+
+@functools.lru_cache(maxsize=8)
+def _zhang_fit_penalty(num_points: int, lambda_: float) -> np.ndarray:
+    """
+    Construct (and cache) the penalty matrix $\\lambda D^T D$ used by `_zhang_fit()`,
+    where $D$ is the first-order difference operator.
+
+    Parameters
+    ----------
+    `num_points`: number of points in the diffractogram
+
+    `lambda_`: smoothing parameter
+
+    Return Value
+    ------------
+    read-only penalty matrix in the upper banded format used by
+    `scipy.linalg.solveh_banded()`: row 0 contains the superdiagonal (the first element
+    is unused) and row 1 contains the main diagonal.
+
+    Notes
+    -----
+    * The penalty matrix depends only on the diffractogram length and `lambda_`, so it
+      can be shared across diffractograms measured on the same grid.
+    """
+    penalty = np.zeros((2, num_points))
+
+    # Superdiagonal
+    penalty[0, 1:] = -lambda_
+
+    # Main diagonal
+    penalty[1, :-1] += lambda_
+    penalty[1, 1:] += lambda_
+
+    penalty.flags.writeable = False
+
+    return penalty
@@ -5,20 +5,20 @@ Main CLI program for PXRD analysis
 # --- Imports
 
 # Standard library
+import concurrent.futures
+import functools
 import logging
 import math
 import os
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Optional, TYPE_CHECKING
 
 # External packages
-import numpy as np
 from rich.console import Console
 import typer
 
-# Local package
-import pxrd_tools.analyze
-import pxrd_tools.io
+if TYPE_CHECKING:
+    import numpy as np
 
 
 # --- Constants
@@ -31,13 +31,23 @@ from .shared import QUIET_OPTION, DEFAULT_QUIET_OPTION
 from .shared import LOG_FILE_OPTION, DEFAULT_LOG_FILE
 from .shared import LOG_RECORD_FORMAT
 
-# Analysis parameters
-from pxrd_tools.analyze import (
+# Analysis parameters. Note: the parameters are imported from `pxrd_tools._defaults`
+# (rather than `pxrd_tools.analyze`) so that the CLI does not import NumPy and SciPy
+# until a command is run.
+from pxrd_tools._defaults import (
     _MIN_INTENSITY_QUANTILE,
     _MIN_PEAK_WIDTH_TWO_THETA,
     _MIN_PROMINENCE_QUANTILE,
+    _VALID_INTENSITY_SCALES,
 )
 
+# Data file delimiters by file extension. Note: data files with other extensions are
+# read as comma-separated files.
+_DATA_FILE_DELIMITERS = {".prn": r"\s+"}
+
+# Extensions of data files selected by default by batch commands
+_DATA_FILE_EXTENSIONS = [".csv", *_DATA_FILE_DELIMITERS]
+
 # Typer app
 app = typer.Typer()
 
@@ -65,11 +75,10 @@ def main(
 # --- Commands
 
 # CLI arguments and options
-_VALID_INTENSITY_SCALE_OPTIONS = ["count", "sqrt", "log"]
 _INTENSITY_SCALE_OPTION = typer.Option(
     "--intensity-scale",
     "-I",
-    help=f"Intensity scale. Valid values: {_VALID_INTENSITY_SCALE_OPTIONS}",
+    help=f"Intensity scale. Valid values: {_VALID_INTENSITY_SCALES}",
 )
 
 _VALID_HORIZONTAL_SCALE_OPTIONS = ["1/d", "2-theta"]
@@ -132,6 +141,171 @@ def peaks(
     """
     Identify peaks in PXRD data contained in `data_file`.
     """
+    # --- Check arguments
+
+    intensity_scale, horizontal_scale = _check_scale_options(
+        intensity_scale, horizontal_scale
+    )
+
+    # --- Find PXRD peaks
+
+    peaks, peak_widths = _find_peaks_in_data_file(
+        data_file,
+        intensity_scale=intensity_scale,
+        horizontal_scale=horizontal_scale,
+        min_intensity_quantile=min_intensity_quantile,
+        min_peak_width=min_peak_width,
+        min_prominence_quantile=min_prominence_quantile,
+        x_ray_wavelength=x_ray_wavelength,
+    )
+
+    # Print results to stdout
+    for peak, peak_width in zip(peaks, peak_widths):
+        print(f"{peak}, {peak_width}")
+
+
+# CLI arguments and options
+_DATA_DIR_ARG = typer.Argument(
+    ...,
+    help=(
+        "Directory containing PXRD data files. "
+        "Each data file is expected to specify a 'count' value for each '2-theta' "
+        "value."
+    ),
+)
+
+_DATA_FILE_PATTERN_OPTION = typer.Option(
+    "--pattern",
+    help=(
+        "Glob pattern (relative to the data directory) used to select data files in "
+        "the data directory. "
+        f"Default: all files with extensions {_DATA_FILE_EXTENSIONS}"
+    ),
+)
+
+_MAX_WORKERS_OPTION = typer.Option(
+    "--max-workers",
+    "-j",
+    min=1,
+    help="Maximum number of worker processes. Default: number of CPUs",
+)
+
+
+@app.command()
+def peaks_batch(
+    data_dir: Annotated[Path, _DATA_DIR_ARG],
+    data_file_pattern: Annotated[Optional[str], _DATA_FILE_PATTERN_OPTION] = None,
+    intensity_scale: Annotated[str, _INTENSITY_SCALE_OPTION] = "sqrt",
+    horizontal_scale: Annotated[str, _HORIZONTAL_SCALE_OPTION] = "1/d",
+    min_intensity_quantile: Annotated[
+        float, _MIN_INTENSITY_QUANTILE_OPTION
+    ] = _MIN_INTENSITY_QUANTILE,
+    min_peak_width: Annotated[
+        float, _MIN_PEAK_WIDTH_OPTION
+    ] = _MIN_PEAK_WIDTH_TWO_THETA,
+    min_prominence_quantile: Annotated[
+        float, _MIN_PROMINENCE_QUANTILE_OPTION
+    ] = _MIN_PROMINENCE_QUANTILE,
+    x_ray_wavelength: Annotated[
+        float, _X_RAY_WAVELENGTH_OPTION
+    ] = _DEFAULT_X_RAY_WAVELENGTH,
+    max_workers: Annotated[Optional[int], _MAX_WORKERS_OPTION] = None,
+    quiet_local: Annotated[bool, QUIET_OPTION] = DEFAULT_QUIET_OPTION,
+) -> None:
+    """
+    Identify peaks in PXRD data contained in the data files in `data_dir`.
+
+    Data files are processed in parallel. Output: data file, peak location, peak width.
+
+    Data files that cannot be processed are reported to stderr and skipped.
+    """
+    # --- Create error console
+
+    error_console = Console(stderr=True)
+
+    # --- Check arguments
+
+    intensity_scale, horizontal_scale = _check_scale_options(
+        intensity_scale, horizontal_scale
+    )
+
+    if not data_dir.is_dir():
+        error_console.print(f"Data directory '{data_dir}' not found.")
+        raise typer.Abort()
+
+    # Note: Path.glob() does not support absolute patterns
+    if data_file_pattern is not None and Path(data_file_pattern).is_absolute():
+        raise typer.BadParameter(
+            f"'{data_file_pattern}' is an absolute pattern. Patterns should be "
+            "relative to the data directory.",
+            param_hint="'--pattern'",
+        )
+
+    # --- Find PXRD peaks
+
+    # Select data files
+    if data_file_pattern is None:
+        data_files = sorted(
+            path
+            for path in data_dir.iterdir()
+            if path.is_file() and path.suffix.lower() in _DATA_FILE_EXTENSIONS
+        )
+    else:
+        data_files = sorted(
+            path for path in data_dir.glob(data_file_pattern) if path.is_file()
+        )
+
+    find_peaks_in_data_file = functools.partial(
+        _try_find_peaks_in_data_file,
+        intensity_scale=intensity_scale,
+        horizontal_scale=horizontal_scale,
+        min_intensity_quantile=min_intensity_quantile,
+        min_peak_width=min_peak_width,
+        min_prominence_quantile=min_prominence_quantile,
+        x_ray_wavelength=x_ray_wavelength,
+    )
+
+    # Note: data files are independent, so they are processed in separate processes.
+    # Results are printed by the main process in the order of `data_files`.
+    num_failed_data_files = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for data_file, (peaks, peak_widths, error) in zip(
+            data_files, executor.map(find_peaks_in_data_file, data_files)
+        ):
+            if error is not None:
+                num_failed_data_files += 1
+                error_console.print(
+                    f"Failed to process data file '{data_file}'. {error}", markup=False
+                )
+                continue
+
+            for peak, peak_width in zip(peaks, peak_widths):
+                print(f"{data_file}, {peak}, {peak_width}")
+
+    # Exit with an error status if any data files could not be processed
+    if num_failed_data_files > 0:
+        raise typer.Exit(code=1)
+
+
+# --- Helper functions
+
+
+def _check_scale_options(intensity_scale: str, horizontal_scale: str) -> (str, str):
+    """
+    Check the intensity and horizontal scale options.
+
+    Parameters
+    ----------
+    intensity_scale: intensity scale
+
+    horizontal_scale: horizontal scale
+
+    Return value
+    ------------
+    intensity_scale: lowercase intensity scale
+
+    horizontal_scale: lowercase horizontal scale
+    """
     # --- Create error console
 
     error_console = Console(stderr=True)
@@ -141,10 +315,10 @@ def peaks(
     # Ensure that intensity_scale is lowercase
     intensity_scale = intensity_scale.lower()
 
-    if intensity_scale not in _VALID_INTENSITY_SCALE_OPTIONS:
+    if intensity_scale not in _VALID_INTENSITY_SCALES:
         message = (
             f"'{intensity_scale}' is not a valid intensity scale. "
-            f"Valid values: {_VALID_INTENSITY_SCALE_OPTIONS}"
+            f"Valid values: {_VALID_INTENSITY_SCALES}"
         )
         error_console.print(message)
         raise typer.Abort()
@@ -160,32 +334,98 @@ def peaks(
         error_console.print(message)
         raise typer.Abort()
 
+    return intensity_scale, horizontal_scale
+
+
+def _try_find_peaks_in_data_file(
+    data_file: Path, **kwargs
+) -> ("np.ndarray", "np.ndarray", Optional[str]):
+    """
+    Identify peaks in PXRD data contained in `data_file`. Unlike
+    `_find_peaks_in_data_file()`, errors are returned instead of raised so that a batch
+    of data files can be processed even if some of the data files are invalid.
+
+    Parameters
+    ----------
+    data_file: PXRD data file
+
+    kwargs: keyword arguments for `_find_peaks_in_data_file()`
+
+    Return value
+    ------------
+    peaks: peak locations (None if an error occurred)
+
+    peak_widths: peak widths (None if an error occurred)
+
+    error: error message (None if no error occurred)
+    """
+    try:
+        peaks, peak_widths = _find_peaks_in_data_file(data_file, **kwargs)
+    except Exception as error:
+        return None, None, f"{type(error).__name__}: {error}"
+
+    return peaks, peak_widths, None
+
+
+def _find_peaks_in_data_file(
+    data_file: Path,
+    intensity_scale: str,
+    horizontal_scale: str,
+    min_intensity_quantile: float,
+    min_peak_width: float,
+    min_prominence_quantile: float,
+    x_ray_wavelength: float,
+) -> ("np.ndarray", "np.ndarray"):
+    """
+    Identify peaks in PXRD data contained in `data_file`.
+
+    Parameters
+    ----------
+    data_file: PXRD data file
+
+    intensity_scale: intensity scale (lowercase)
+
+    horizontal_scale: horizontal scale (lowercase)
+
+    min_intensity_quantile: see `pxrd_tools.analyze.find_peaks()`
+
+    min_peak_width: see `min_width` argument of `pxrd_tools.analyze.find_peaks()`
+
+    min_prominence_quantile: see `pxrd_tools.analyze.find_peaks()`
+
+    x_ray_wavelength: wavelength of X-ray radiation used to collect diffractogram
+
+    Return value
+    ------------
+    peaks: peak locations (in units of `horizontal_scale`)
+
+    peak_widths: peak widths (in units of `horizontal_scale`)
+    """
+    # --- Imports
+    #
+    # Note: analysis packages are imported when the command is run to reduce the
+    # start-up time of the CLI.
+
+    import numpy as np
+
+    import pxrd_tools.analyze
+    import pxrd_tools.io
+
     # --- Preparations
 
     # Set data file delimiter based on file extension
     _, ext = os.path.splitext(data_file)
-    if ext == ".prn":
-        delimiter = r"\s+"
-    else:
-        delimiter = None
+    delimiter = _DATA_FILE_DELIMITERS.get(ext.lower())
 
     # Load PXRD data
-    data = pxrd_tools.io.read_csv(data_file, delimiter=delimiter)
-
-    # Extract 2-theta and count data
-    two_theta = data["2-theta"].to_numpy()
-    intensity = data["count"].to_numpy()
+    two_theta, intensity = pxrd_tools.io.read_pxrd(data_file, delimiter=delimiter)
 
     # --- Find PXRD peaks
 
-    # Rescale intensity
-    if intensity_scale == "sqrt":
-        intensity = np.sqrt(intensity)
-    elif intensity_scale == "log":
-        intensity = np.log(intensity + 1)
-
-    # Apply diffractogram corrections
-    intensity = pxrd_tools.analyze.apply_diffractogram_corrections(two_theta, intensity)
+    # Rescale intensity and apply diffractogram corrections
+    intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
+        two_theta, intensity, intensity_scale=intensity_scale
+    )
 
     # Identify diffractogram peaks
     peaks, peak_widths, _ = pxrd_tools.analyze.find_peaks(
@@ -196,15 +436,16 @@ def peaks(
         min_prominence_quantile=min_prominence_quantile,
     )
 
-    # --- Construct output
+    # --- Convert horizontal scale
 
-    # Convert horizontal scale
+    # Note: theta (in radians) and the scale factors are computed once and reused for
+    # the peak positions and widths.
     if horizontal_scale == "1/d":
-        peak_widths *= (
-            2 / x_ray_wavelength * np.cos(peaks * math.pi / 360) * math.pi / 360
-        )
-        peaks = 2 / x_ray_wavelength * np.sin(peaks * math.pi / 360)
-
-    # Print results to stdout
-    for peak, peak_width in zip(peaks, peak_widths):
-        print(f"{peak}, {peak_width}")
+        theta = peaks * (math.pi / 360)
+        inverse_wavelength = 2 / x_ray_wavelength
+        peak_widths *= np.cos(theta)
+        peak_widths *= inverse_wavelength * (math.pi / 360)
+        peaks = np.sin(theta, out=theta)
+        peaks *= inverse_wavelength
+
+    return peaks, peak_widths
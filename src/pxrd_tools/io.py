@@ -5,11 +5,13 @@ Data loading functions
 # --- Imports
 
 # Standard library
+import functools
 import os
 from pathlib import Path
 import typing
 
 # External packages
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
@@ -18,12 +20,19 @@ from pandas import DataFrame
 
 _PXRD_DATAFRAME_COLUMNS = ["2-theta", "count"]
 
+# Delimiter translations for numpy.loadtxt(). Note: a delimiter of None instructs
+# numpy.loadtxt() to split on any whitespace.
+_LOADTXT_DELIMITERS = {None: ",", r"\s+": None}
+
+# Maximum number of data files with parsed data cached by read_pxrd()
+_READ_PXRD_CACHE_SIZE = 16
+
 # --- Functions
 
 
-def read_csv(
+def read_pxrd(
     path: typing.Union[str, Path], delimiter: typing.Optional[str] = None
-) -> DataFrame:
+) -> (np.ndarray, np.ndarray):
     """
     Read powder X-ray diffractogram from an ASCII file containing two columns: 2-theta
     and count.
@@ -32,12 +41,31 @@ def read_csv(
     ----------
     path: path to data file
 
-    delimiter: path to data file. Note: use a raw string when setting `delimiter` to a
-    regular expression.
+    delimiter: delimiter used in the data file. Note: use a raw string when setting
+    `delimiter` to a regular expression.
 
     Return value
     ------------
-    DataFrame containing powder X-ray diffractogram
+    two_theta: 2-theta values
+
+    count: count values
+
+    Notes
+    -----
+    * `two_theta` and `count` are returned as C-contiguous float64 arrays, which can be
+      passed directly to the functions in `pxrd_tools.analyze` without being copied.
+
+    * Parsed data is cached by file path, modification time, and size, so repeated
+      reads of an unchanged file are not re-parsed. Each call returns new arrays, so
+      modifying the returned arrays does not affect the cached data.
+
+    * A data file that is rewritten without changing its size within the
+      modification-time resolution of the file system (e.g., 2 seconds on FAT
+      file systems) is not detected as modified, so stale data is returned until the
+      file's modification time changes. `pxrd_tools.io.clear_cache()` discards the
+      cached data.
+
+    * The parsed data for up to 16 data files is kept in memory.
     """
     # --- Check arguments
 
@@ -45,21 +73,108 @@ def read_csv(
     if not os.path.isfile(path):
         raise ValueError(f"Data file '{path}' not found.")
 
-    # Ensure that path is str
-    path = str(path)
-
     # --- Load data from file
 
-    # Load data set from file
-    diffractogram = pd.read_csv(
-        path,
-        header=None,
-        delimiter=delimiter,
-        names=_PXRD_DATAFRAME_COLUMNS,
-        index_col=False,
-    )
+    # Note: the cached data is read-only, so it is copied before it is returned
+    stat = os.stat(path)
+    data = _read_pxrd_data(
+        os.path.abspath(path), stat.st_mtime_ns, stat.st_size, delimiter
+    ).copy()
+
+    return data[0], data[1]
+
+
+def clear_cache() -> None:
+    """
+    Discard the data cached by `read_pxrd()`.
+    """
+    _read_pxrd_data.cache_clear()
+
+
+@functools.lru_cache(maxsize=_READ_PXRD_CACHE_SIZE)
+def _read_pxrd_data(
+    path: str, mtime_ns: int, size: int, delimiter: typing.Optional[str]
+) -> np.ndarray:
+    """
+    Parse powder X-ray diffractogram data file.
+
+    Parameters
+    ----------
+    path: absolute path to data file
+
+    mtime_ns: modification time of data file (in nanoseconds). Only used as part of the
+    cache key.
 
-    return diffractogram
+    size: size of data file (in bytes). Only used as part of the cache key.
+
+    delimiter: delimiter used in the data file
+
+    Return value
+    ------------
+    read-only 2 x N array containing 2-theta values (first row) and count values
+    (second row)
+    """
+    data = None
+
+    # Use NumPy's parser for simple delimiters (it is faster than pandas' parser for
+    # numeric data). Fall back to pandas' parser for regular expression delimiters and
+    # for files that NumPy cannot parse (e.g., files with missing values).
+    if delimiter in _LOADTXT_DELIMITERS or len(delimiter) == 1:
+        try:
+            data = np.loadtxt(
+                path,
+                delimiter=_LOADTXT_DELIMITERS.get(delimiter, delimiter),
+                usecols=(0, 1),
+                ndmin=2,
+            )
+        except ValueError:
+            pass
+
+    if data is None:
+        data = pd.read_csv(
+            path,
+            header=None,
+            delimiter=delimiter,
+            names=_PXRD_DATAFRAME_COLUMNS,
+            dtype=np.float64,
+            index_col=False,
+        ).to_numpy()
+
+    # Store each column of data in a contiguous block of memory
+    data = np.ascontiguousarray(data.T)
+    data.setflags(write=False)
+
+    return data
+
+
+def read_csv(
+    path: typing.Union[str, Path], delimiter: typing.Optional[str] = None
+) -> DataFrame:
+    """
+    Read powder X-ray diffractogram from an ASCII file containing two columns: 2-theta
+    and count.
+
+    Parameters
+    ----------
+    path: path to data file
+
+    delimiter: delimiter used in the data file. Note: use a raw string when setting
+    `delimiter` to a regular expression.
+
+    Return value
+    ------------
+    DataFrame containing powder X-ray diffractogram. Both columns are parsed as
+    float64 values.
+
+    Notes
+    -----
+    * When only the 2-theta and count values are needed, `read_pxrd()` avoids the
+      overhead of constructing a DataFrame.
+    """
+    return DataFrame(
+        dict(zip(_PXRD_DATAFRAME_COLUMNS, read_pxrd(path, delimiter=delimiter))),
+        copy=False,
+    )
 
 
 def read_prn(path: typing.Union[str, Path]) -> DataFrame:
@@ -4,19 +4,293 @@ Unit tests for `pxrd_tools.analyze` module
 # --- Imports
 
 # Standard library
-import copy
 import os
+import re
 import unittest
 
 # External packages
 import numpy as np
 import pytest
+import scipy
 
 # Local packages/modules
 import pxrd_tools.analyze
-import pxrd_tools.io
 
 
+# --- Constants
+
+# Valid data for argument checks. Note: the arrays are read-only so that they can be
+# shared by all tests.
+_TWO_THETA_VALID = np.linspace(1, 2)
+_TWO_THETA_VALID.setflags(write=False)
+
+_INTENSITY_VALID = np.linspace(1, 10)
+_INTENSITY_VALID.setflags(write=False)
+
+# Valid 2-theta values with a non-terminating spacing that are rounded to 3 decimal
+# places (as in data files). Note: the spacing of the rounded values alternates between
+# 0.013 and 0.014.
+_TWO_THETA_ROUNDED = np.round(5 + 0.0131303 * np.arange(500), 3)
+_TWO_THETA_ROUNDED.setflags(write=False)
+
+# Invalid two_theta and intensity arguments (and expected error messages). Note: the
+# cases are parametrized so that each case is reported separately.
+_INVALID_TWO_THETA_AND_INTENSITY = [
+    pytest.param(
+        np.array([[1, 2], [4, 4]]),
+        _INTENSITY_VALID,
+        "'two_theta' should be a 1D vector",
+        id="two-theta-is-not-a-1D-vector",
+    ),
+    pytest.param(
+        np.array(1.0),
+        _INTENSITY_VALID,
+        "'two_theta' should be a 1D vector",
+        id="two-theta-is-a-scalar",
+    ),
+    pytest.param(
+        np.array([]),
+        _INTENSITY_VALID,
+        "'two_theta' should not be empty",
+        id="two-theta-is-empty",
+    ),
+    pytest.param(
+        _TWO_THETA_VALID,
+        np.array([[1, 2], [4, 4]]),
+        "'intensity' should be a 1D vector",
+        id="intensity-is-not-a-1D-vector",
+    ),
+    pytest.param(
+        _TWO_THETA_VALID,
+        np.array([]),
+        "'intensity' should not be empty",
+        id="intensity-is-empty",
+    ),
+    pytest.param(
+        _TWO_THETA_VALID,
+        np.empty(_TWO_THETA_VALID.size + 1, dtype=np.float64),
+        "'two_theta' and 'intensity' should be the same size",
+        id="two-theta-and-intensity-are-not-the-same-size",
+    ),
+    pytest.param(
+        np.array([1.0]),
+        np.array([1.0]),
+        "'two_theta' should contain at least 2 values",
+        id="two-theta-contains-a-single-value",
+    ),
+    pytest.param(
+        _TWO_THETA_VALID[::-1],
+        _INTENSITY_VALID,
+        "'two_theta' should be increasing",
+        id="two-theta-is-decreasing",
+    ),
+    pytest.param(
+        _TWO_THETA_VALID**2,
+        _INTENSITY_VALID,
+        "'two_theta' should be uniformly spaced",
+        id="two-theta-is-not-uniformly-spaced",
+    ),
+    pytest.param(
+        np.delete(np.linspace(1, 2, num=_INTENSITY_VALID.size + 1), 25),
+        _INTENSITY_VALID,
+        "'two_theta' should be uniformly spaced",
+        id="two-theta-is-missing-a-value",
+    ),
+]
+
+# Invalid data correction parameters (and expected error messages). Note: the cases are
+# parametrized so that each case is reported separately.
+_INVALID_DATA_CORRECTION_PARAMETERS = [
+    pytest.param(
+        {"filter_order": 0}, "'filter_order' should be positive", id="filter_order=0"
+    ),
+    pytest.param(
+        {"filter_order": -5}, "'filter_order' should be positive", id="filter_order=-5"
+    ),
+    pytest.param(
+        {"filter_window_size": 0},
+        "'filter_window_size' should be positive",
+        id="filter_window_size=0",
+    ),
+    pytest.param(
+        {"filter_window_size": -5},
+        "'filter_window_size' should be positive",
+        id="filter_window_size=-5",
+    ),
+    pytest.param(
+        {"zhang_fit_repetitions": 0},
+        "'zhang_fit_repetitions' should be positive",
+        id="zhang_fit_repetitions=0",
+    ),
+    pytest.param(
+        {"zhang_fit_repetitions": -5},
+        "'zhang_fit_repetitions' should be positive",
+        id="zhang_fit_repetitions=-5",
+    ),
+    pytest.param(
+        {"intensity_scale": "linear"},
+        "Invalid 'intensity_scale' value: linear.",
+        id="intensity_scale=linear",
+    ),
+    pytest.param(
+        {"dtype": np.int64}, "Invalid 'dtype' value: int64.", id="dtype=np.int64"
+    ),
+    pytest.param({"dtype": "foo"}, "Invalid 'dtype' value: foo.", id="dtype=foo"),
+]
+
+# Invalid peak detection parameters (and expected error messages). Note: the cases are
+# parametrized so that each case is reported separately.
+_INVALID_PEAK_DETECTION_PARAMETERS = [
+    pytest.param(
+        {"min_intensity_quantile": -1},
+        "Invalid 'min_intensity_quantile' value: -1. "
+        "'min_intensity_quantile' should lie in the interval [0, 1].",
+        id="min_intensity_quantile=-1",
+    ),
+    pytest.param(
+        {"min_intensity_quantile": 2},
+        "Invalid 'min_intensity_quantile' value: 2. "
+        "'min_intensity_quantile' should lie in the interval [0, 1].",
+        id="min_intensity_quantile=2",
+    ),
+    pytest.param({"min_width": 0}, "'min_width' should be positive", id="min_width=0"),
+    pytest.param(
+        {"min_width": -5}, "'min_width' should be positive", id="min_width=-5"
+    ),
+    pytest.param(
+        {"min_prominence_quantile": -1},
+        "Invalid 'min_prominence_quantile' value: -1. "
+        "'min_prominence_quantile' should lie in the interval [0, 1].",
+        id="min_prominence_quantile=-1",
+    ),
+    pytest.param(
+        {"min_prominence_quantile": 2},
+        "Invalid 'min_prominence_quantile' value: 2. "
+        "'min_prominence_quantile' should lie in the interval [0, 1].",
+        id="min_prominence_quantile=2",
+    ),
+]
+
+# Expected peak indices for the zircon diffractogram
+_EXPECTED_PEAK_INDICES = np.array(
+    [
+        749,
+        1099,
+        1440,
+        1529,
+        1677,
+        1782,
+        1939,
+        2128,
+        2358,
+        2422,
+        2530,
+        2735,
+        2846,
+        2893,
+        3140,
+        3149,
+        3188,
+        3416,
+        3425,
+        3519,
+        3556,
+        3788,
+        3800,
+        3878,
+        3890,
+        4149,
+        4189,
+        4203,
+        4362,
+        4414,
+        4428,
+        4462,
+        4476,
+        4502,
+        4518,
+        4956,
+        4995,
+        5431,
+        5453,
+        5474,
+        5496,
+        5630,
+        5667,
+        5726,
+        5750,
+        5782,
+        5804,
+        6155,
+        6183,
+        6513,
+        6547,
+        7163,
+    ],
+    dtype=np.int64,
+)
+
+
+# Expected peak widths for the zircon diffractogram. Note: the peak widths depend on the
+# corrected intensity near the ends of the diffractogram (through the baseline and the
+# peak prominences), so they also check the edge handling of the data corrections.
+_EXPECTED_PEAK_WIDTHS = np.array(
+    [
+        0.173330,
+        0.171486,
+        0.192295,
+        0.222466,
+        0.210911,
+        0.223212,
+        0.217471,
+        0.309639,
+        0.233985,
+        0.246677,
+        0.259419,
+        0.284349,
+        0.336046,
+        0.294825,
+        0.310370,
+        0.034517,
+        0.349006,
+        0.374007,
+        0.047355,
+        0.470208,
+        0.177353,
+        0.237638,
+        0.069442,
+        0.185801,
+        0.104043,
+        0.248099,
+        0.354282,
+        0.076833,
+        0.148218,
+        0.296271,
+        0.117875,
+        0.343352,
+        0.065257,
+        0.177507,
+        0.097498,
+        0.260687,
+        1.114619,
+        0.161661,
+        0.064016,
+        0.320315,
+        0.152048,
+        0.493070,
+        0.150583,
+        0.347157,
+        0.144730,
+        0.369772,
+        0.149071,
+        0.577450,
+        0.227456,
+        0.512279,
+        0.181908,
+        0.412864,
+    ]
+)
+
 # --- Test Suites
 
 
@@ -27,14 +301,36 @@ class test_pxrd_tools_analyze(unittest.TestCase):
 
     # --- Fixtures
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Prepare for test.
+        Prepare for tests in test suite.
+
+        The zircon diffractogram is loaded and corrected once for all tests. The arrays
+        are made read-only so that tests cannot modify them.
         """
-        self.test_pxrd_data_file = os.path.abspath(
+        cls.test_pxrd_data_file = os.path.abspath(
             os.path.join(os.path.dirname(__file__), "data", "zircon.prn")
         )
 
+        # Note: pxrd_tools.io (and pandas) is only imported when the test suite is run
+        import pxrd_tools.io
+
+        cls.two_theta, cls.intensity = pxrd_tools.io.read_pxrd(
+            cls.test_pxrd_data_file, delimiter=r"\s+"
+        )
+        cls.corrected_intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
+            cls.two_theta, cls.intensity
+        )
+
+        for array in [cls.two_theta, cls.intensity, cls.corrected_intensity]:
+            array.setflags(write=False)
+
+    def setUp(self):
+        """
+        Prepare for test.
+        """
+
     def tearDown(self):
         """
         Clean up after test.
@@ -50,151 +346,32 @@ class test_pxrd_tools_analyze(unittest.TestCase):
         # --- Preparations
 
         # valid data
-        two_theta_valid = np.linspace(1, 2)
-        intensity_valid = np.linspace(1, 10)
+        two_theta_valid = _TWO_THETA_VALID
+        intensity_valid = _INTENSITY_VALID
 
         # --- Exercise functionality and check results
 
-        # ------ two_theta
-
-        # intensity is not a NumPy array
-        try:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid.tolist(), intensity_valid, filter_window_size=None
-            )
-            assert True
-        except Exception:
-            pytest.fail("`intensity` as a list raised error")
-
-        # two_theta is not a 1D vector
-        two_theta_test = np.array([[1, 2], [4, 4]])
+        # ------ two_theta and intensity
 
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_test, intensity_valid
-            )
-
-        assert "two_theta' should be a 1D vector" in str(exception_info)
-
-        # two_theta is empty
-        two_theta_test = np.array([])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_test, intensity_valid
-            )
-
-        assert "'two_theta' should not be empty" in str(exception_info)
-
-        # ------ intensity
-
-        # intensity is not a NumPy array
-        try:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid.tolist(), filter_window_size=None
-            )
-            assert True
-        except Exception:
-            pytest.fail("`intensity` as a list raised error")
-
-        # intensity is not a 1D vector
-        intensity_test = np.array([[1, 2], [4, 4]])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_test
-            )
-
-        assert "'intensity' should be a 1D vector" in str(exception_info)
-
-        # intensity is empty
-        intensity_test = np.array([])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_test
-            )
-
-        assert "'intensity' should not be empty" in str(exception_info)
-
-        # ------ two_theta and intensity not the same size
-
-        intensity_test = np.append(two_theta_valid, 0)
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_test
-            )
-
-        assert "'two_theta' and 'intensity' should be the same size" in str(
-            exception_info
+        # two_theta and intensity are not NumPy arrays
+        pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta_valid.tolist(), intensity_valid, filter_window_size=None
+        )
+        pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta_valid, intensity_valid.tolist(), filter_window_size=None
         )
 
-        # ------ filter_order
-
-        # filter_order = 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, filter_order=0
-            )
-
-        assert "'filter_order' should be positive" in str(exception_info)
-
-        # filter_order < 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, filter_order=-5
-            )
-
-        assert "'filter_order' should be positive" in str(exception_info)
-
-        # ------ filter_window_size
-
-        # filter_window_size = 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, filter_window_size=0
-            )
-
-        assert "'filter_window_size' should be positive" in str(exception_info)
-
-        # filter_window_size < 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, filter_window_size=-5
-            )
+        # two_theta is uniformly spaced but rounded
+        pxrd_tools.analyze.apply_diffractogram_corrections(
+            _TWO_THETA_ROUNDED, np.linspace(1, 10, num=_TWO_THETA_ROUNDED.size)
+        )
 
-        assert "'filter_window_size' should be positive" in str(exception_info)
+        # ------ data correction parameters
 
         # filter_window_size = None
-        try:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, filter_window_size=None
-            )
-            assert True
-        except Exception:
-            pytest.fail(
-                "`filter_window_size` set to `None` with valid `two_theta` and "
-                "`intensity` raised error"
-            )
-
-        # ------ zhang_fit_repetitions
-
-        # zhang_fit_repetitions = 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, zhang_fit_repetitions=0
-            )
-
-        assert "'zhang_fit_repetitions' should be positive" in str(exception_info)
-
-        # zhang_fit_repetitions < 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_valid, intensity_valid, zhang_fit_repetitions=-5
-            )
-
-        assert "'zhang_fit_repetitions' should be positive" in str(exception_info)
+        pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta_valid, intensity_valid, filter_window_size=None
+        )
 
         # ------ length of data less than filter_window
 
@@ -203,15 +380,28 @@ class test_pxrd_tools_analyze(unittest.TestCase):
 
         filter_window_size = 10
 
-        with pytest.raises(ValueError) as exception_info:
+        with pytest.raises(
+            ValueError,
+            match=re.escape(
+                "'filter_window_size' should be less than or equal to the size of "
+                "'intensity'"
+            ),
+        ):
             pxrd_tools.analyze.apply_diffractogram_corrections(
                 two_theta_test, intensity_test, filter_window_size=filter_window_size
             )
 
-        assert (
-            "If mode is 'interp', window_length must be less than or equal to the "
-            "size of x." in str(exception_info)
+        # ------ default filter_window_size for short data with an even length
+
+        # Note: the default filter window size rounded up to an odd integer (7) is
+        # larger than the size of the data (6)
+        two_theta_test = np.linspace(1, 1.175, num=6)
+        intensity_test = np.linspace(1, 10, num=6)
+
+        corrected_intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta_test, intensity_test
         )
+        assert corrected_intensity.shape == intensity_test.shape
 
     @staticmethod
     def test_apply_diffractogram_corrections():
@@ -235,17 +425,106 @@ class test_pxrd_tools_analyze(unittest.TestCase):
         assert isinstance(corrected_intensity_no_noise, np.ndarray)
         assert len(corrected_intensity_no_noise) == len(intensity_no_noise)
 
+        # --- Test intensity rescaling
+
+        # Preparations
+        intensity = np.arange(50)
+        two_theta = np.linspace(1, 2)
+
+        # Exercise functionality and check results
+        for intensity_scale, rescaled_intensity in [
+            ("count", intensity),
+            ("sqrt", np.sqrt(intensity)),
+            ("log", np.log(intensity + 1)),
+        ]:
+            np.testing.assert_allclose(
+                pxrd_tools.analyze.apply_diffractogram_corrections(
+                    two_theta, intensity, intensity_scale=intensity_scale
+                ),
+                pxrd_tools.analyze.apply_diffractogram_corrections(
+                    two_theta, rescaled_intensity
+                ),
+                rtol=1e-12,
+                atol=1e-12,
+            )
+
+        # --- Test default filter window size
+
+        # Preparations
+        intensity = np.linspace(1, 10)
+        two_theta = np.linspace(1, 2)  # 0.2 / delta(2-theta) = 9.8
+
+        # Exercise functionality
+        corrected_intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta, intensity
+        )
+
+        # Check results: the default window size is rounded up to the nearest odd
+        # integer
+        np.testing.assert_array_equal(
+            corrected_intensity,
+            pxrd_tools.analyze.apply_diffractogram_corrections(
+                two_theta, intensity, filter_window_size=11
+            ),
+        )
+
+        # --- Test single-precision corrections
+
+        # Preparations
+        intensity = np.abs(np.sin(np.linspace(0, 20, num=500))) * 100
+        two_theta = np.linspace(1, 10, num=500)
+
+        # Exercise functionality
+        corrected_intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
+            two_theta, intensity, dtype=np.float32
+        )
+
+        # Check results
+        assert corrected_intensity.dtype == np.float32
+        np.testing.assert_allclose(
+            corrected_intensity,
+            pxrd_tools.analyze.apply_diffractogram_corrections(two_theta, intensity),
+            atol=1e-3,
+        )
+
+        # Check that single-precision intensity values are not converted to double
+        # precision during validation
+        intensity = intensity.astype(np.float32)
+        _, validated_intensity, _ = (
+            pxrd_tools.analyze._validate_two_theta_and_intensity_args(
+                two_theta, intensity
+            )
+        )
+        assert validated_intensity is intensity
+
+        # --- Test non-contiguous intensity
+
+        # Preparations
+        intensity = np.abs(np.sin(np.linspace(0, 20, num=1000))) * 100
+        two_theta = np.linspace(1, 10, num=500)
+
+        # Exercise functionality and check results
+        np.testing.assert_array_equal(
+            pxrd_tools.analyze.apply_diffractogram_corrections(
+                two_theta, intensity[::2]
+            ),
+            pxrd_tools.analyze.apply_diffractogram_corrections(
+                two_theta, np.ascontiguousarray(intensity[::2])
+            ),
+        )
+
         # --- Test noise removal
 
         # Preparations
         rng = np.random.default_rng(seed=0)
-        intensity_with_noise = copy.deepcopy(intensity_no_noise)
-        intensity_with_noise += 0.05 * rng.standard_normal(len(intensity_no_noise))
+        intensity_with_noise = intensity_no_noise + 0.05 * rng.standard_normal(
+            intensity_no_noise.size
+        )
 
         # Exercise functionality
         corrected_intensity_with_noise = (
             pxrd_tools.analyze.apply_diffractogram_corrections(
-                two_theta_no_noise, intensity_no_noise
+                two_theta_no_noise, intensity_with_noise
             )
         )
 
@@ -258,164 +537,117 @@ class test_pxrd_tools_analyze(unittest.TestCase):
             rtol=0.1,
         )
 
-    @staticmethod
-    def test_find_peaks_arg_checks():
+    def test_apply_diffractogram_corrections_batch(self):
         """
-        Test argument checks for `find_peaks()`.
+        Test `apply_diffractogram_corrections_batch()`.
         """
         # --- Preparations
 
-        # valid data
-        two_theta_valid = np.linspace(1, 2)
-        intensity_valid = np.linspace(1, 10)
+        two_theta = self.two_theta
+        intensity = self.intensity
 
-        # --- Exercise functionality and check results
+        diffractograms = [
+            (two_theta, intensity),
+            (two_theta, np.sqrt(intensity)),
+            (two_theta[:1000], intensity[:1000]),
+        ]
 
-        # ------ two_theta
+        # --- Exercise functionality
 
-        # two_theta is not a NumPy array
-        try:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid.tolist(),
-                intensity_valid,
+        corrected_intensities = (
+            pxrd_tools.analyze.apply_diffractogram_corrections_batch(
+                diffractograms, max_workers=2
             )
-            assert True
-        except Exception:
-            pytest.fail("`two_theta` as a list raised error")
-
-        # two_theta is not a 1D vector
-        two_theta_test = np.array([[1, 2], [4, 4]])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_test, intensity_valid)
-
-        assert "two_theta' should be a 1D vector" in str(exception_info)
-
-        # two_theta is empty
-        two_theta_test = np.array([])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_test, intensity_valid)
-
-        assert "'two_theta' should not be empty" in str(exception_info)
+        )
 
-        # ------ intensity
+        # --- Check results
 
-        # intensity is not a NumPy array
-        try:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid,
-                intensity_valid.tolist(),
+        assert len(corrected_intensities) == len(diffractograms)
+        for (two_theta, intensity), corrected_intensity in zip(
+            diffractograms, corrected_intensities
+        ):
+            np.testing.assert_array_equal(
+                corrected_intensity,
+                pxrd_tools.analyze.apply_diffractogram_corrections(
+                    two_theta, intensity
+                ),
             )
-            assert True
-        except Exception:
-            pytest.fail("`intensity` as a list raised error")
-
-        # intensity is not a 1D vector
-        intensity_test = np.array([[1, 2], [4, 4]])
-
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_valid, intensity_test)
-
-        assert "'intensity' should be a 1D vector" in str(exception_info)
 
-        # intensity is empty
-        intensity_test = np.array([])
+    @staticmethod
+    def test_quantile():
+        """
+        Test `_quantile()`.
+        """
+        # --- Preparations
 
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_valid, intensity_test)
+        rng = np.random.default_rng(seed=0)
 
-        assert "'intensity' should not be empty" in str(exception_info)
+        # --- Exercise functionality and check results
 
-        # ------ two_theta and intensity not the same size
+        for size in [1, 2, 7, 50, 7251]:
+            values = rng.standard_normal(size)
+            for q in [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1]:
+                np.testing.assert_allclose(
+                    pxrd_tools.analyze._quantile(values, q),
+                    np.quantile(values, q),
+                    rtol=1e-14,
+                )
 
-        intensity_test = np.append(two_theta_valid, 0)
+        # values with ties
+        values = np.array([3, 1, 2, 2, 2, 5, 1], dtype=np.float64)
+        for q in [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1]:
+            assert pxrd_tools.analyze._quantile(values, q) == np.quantile(values, q)
 
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_valid, intensity_test)
+    @staticmethod
+    def test_savgol_filter():
+        """
+        Test `_savgol_filter()`.
+        """
+        # --- Preparations
 
-        assert "'two_theta' and 'intensity' should be the same size" in str(
-            exception_info
-        )
+        rng = np.random.default_rng(seed=0)
+        intensity = rng.standard_normal(20000)
 
-        # ------ min_intensity_quantile
+        # --- Exercise functionality and check results
 
-        # min_intensity_quantile < 0
-        min_intensity_quantile = -1
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid,
-                intensity_valid,
-                min_intensity_quantile=min_intensity_quantile,
+        # Check that the direct and FFT-based convolutions agree with
+        # scipy.signal.savgol_filter() (including near the ends of the data) for both
+        # odd and even window sizes
+        for window_size in [11, 200, 201]:
+            filtered_intensity = pxrd_tools.analyze._savgol_filter(
+                intensity, window_size, 3
             )
-
-        assert (
-            f"Invalid 'min_intensity_quantile' value: {min_intensity_quantile}. "
-            "'min_intensity_quantile' should lie in the interval [0, 1]."
-            in str(exception_info)
-        )
-
-        # min_intensity_quantile > 1
-        min_intensity_quantile = 2
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid,
-                intensity_valid,
-                min_intensity_quantile=min_intensity_quantile,
+            expected_intensity = scipy.signal.savgol_filter(
+                intensity, window_size, 3, mode="interp"
             )
 
-        assert (
-            f"Invalid 'min_intensity_quantile' value: {min_intensity_quantile}. "
-            "'min_intensity_quantile' should lie in the interval [0, 1]."
-            in str(exception_info)
-        )
-
-        # ------ min_width
-
-        # min_width = 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(two_theta_valid, intensity_valid, min_width=0)
-
-        assert "'min_width' should be positive" in str(exception_info)
-
-        # min_width < 0
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid, intensity_valid, min_width=-5
+            assert filtered_intensity.shape == intensity.shape
+            np.testing.assert_allclose(
+                filtered_intensity, expected_intensity, rtol=0, atol=1e-12
             )
 
-        assert "'min_width' should be positive" in str(exception_info)
+    @staticmethod
+    def test_find_peaks_arg_checks():
+        """
+        Test argument checks for `find_peaks()`.
+        """
+        # --- Preparations
 
-        # ------ min_prominence_quantile
+        # valid data
+        two_theta_valid = _TWO_THETA_VALID
+        intensity_valid = _INTENSITY_VALID
 
-        # min_prominence_quantile < 0
-        min_prominence_quantile = -1
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid,
-                intensity_valid,
-                min_prominence_quantile=min_prominence_quantile,
-            )
+        # --- Exercise functionality and check results
 
-        assert (
-            f"Invalid 'min_prominence_quantile' value: {min_prominence_quantile}. "
-            "'min_prominence_quantile' should lie in the interval [0, 1]."
-            in str(exception_info)
-        )
+        # ------ two_theta and intensity
 
-        # min_prominence_quantile > 1
-        min_prominence_quantile = 2
-        with pytest.raises(ValueError) as exception_info:
-            pxrd_tools.analyze.find_peaks(
-                two_theta_valid,
-                intensity_valid,
-                min_prominence_quantile=min_prominence_quantile,
-            )
+        # two_theta and intensity are not NumPy arrays
+        pxrd_tools.analyze.find_peaks(two_theta_valid.tolist(), intensity_valid)
+        pxrd_tools.analyze.find_peaks(two_theta_valid, intensity_valid.tolist())
 
-        assert (
-            f"Invalid 'min_prominence_quantile' value: {min_prominence_quantile}. "
-            "'min_prominence_quantile' should lie in the interval [0, 1]."
-            in str(exception_info)
+        # two_theta is uniformly spaced but rounded
+        pxrd_tools.analyze.find_peaks(
+            _TWO_THETA_ROUNDED, np.linspace(1, 10, num=_TWO_THETA_ROUNDED.size)
         )
 
     def test_find_peaks(self):
@@ -424,84 +656,67 @@ class test_pxrd_tools_analyze(unittest.TestCase):
         """
         # --- Preparations
 
-        pxrd_data = pxrd_tools.io.read_csv(self.test_pxrd_data_file, delimiter=r"\s+")
-        two_theta = pxrd_data["2-theta"].to_numpy()
-        intensity = pxrd_data["count"].to_numpy()
-
-        # Apply data corrections
-        corrected_intensity = pxrd_tools.analyze.apply_diffractogram_corrections(
-            two_theta, intensity
-        )
+        two_theta = self.two_theta
 
         # --- Exercise functionality
 
         peaks, peak_widths, peak_indices = pxrd_tools.analyze.find_peaks(
-            two_theta, corrected_intensity
+            two_theta, self.corrected_intensity
         )
 
         # --- Check results
 
         # peak locations
         assert len(peaks) == 52
-        assert np.all(peaks == two_theta[peak_indices])
+        assert np.array_equal(peaks, two_theta[peak_indices])
 
         # peak widths
         assert len(peak_widths) == 52
-        assert np.all(peak_widths >= pxrd_tools.analyze._MIN_PEAK_WIDTH_TWO_THETA)
+        assert peak_widths.min() >= pxrd_tools.analyze._MIN_PEAK_WIDTH_TWO_THETA
+        np.testing.assert_allclose(peak_widths, _EXPECTED_PEAK_WIDTHS, rtol=1e-4)
 
         # peak indices
         assert len(peak_indices) == 52
-        assert list(peak_indices) == [
-            749,
-            1099,
-            1440,
-            1529,
-            1677,
-            1782,
-            1939,
-            2128,
-            2358,
-            2422,
-            2530,
-            2735,
-            2846,
-            2893,
-            3140,
-            3149,
-            3188,
-            3416,
-            3425,
-            3519,
-            3556,
-            3788,
-            3800,
-            3878,
-            3890,
-            4149,
-            4189,
-            4203,
-            4362,
-            4414,
-            4428,
-            4462,
-            4476,
-            4502,
-            4518,
-            4956,
-            4995,
-            5431,
-            5453,
-            5474,
-            5496,
-            5630,
-            5667,
-            5726,
-            5750,
-            5782,
-            5804,
-            6155,
-            6183,
-            6513,
-            6547,
-            7163,
-        ]
+        np.testing.assert_array_equal(peak_indices, _EXPECTED_PEAK_INDICES)
+
+
+# --- Parametrized Tests
+
+
+@pytest.mark.parametrize(
+    "function",
+    [pxrd_tools.analyze.apply_diffractogram_corrections, pxrd_tools.analyze.find_peaks],
+    ids=lambda function: function.__name__,
+)
+@pytest.mark.parametrize(
+    "two_theta_test, intensity_test, message", _INVALID_TWO_THETA_AND_INTENSITY
+)
+def test_two_theta_and_intensity_arg_checks(
+    function, two_theta_test, intensity_test, message
+):
+    """
+    Test checks of invalid `two_theta` and `intensity` arguments.
+    """
+    with pytest.raises(ValueError, match=re.escape(message)):
+        function(two_theta_test, intensity_test)
+
+
+@pytest.mark.parametrize("kwargs, message", _INVALID_DATA_CORRECTION_PARAMETERS)
+def test_apply_diffractogram_corrections_parameter_arg_checks(kwargs, message):
+    """
+    Test checks of invalid data correction parameters for
+    `apply_diffractogram_corrections()`.
+    """
+    with pytest.raises(ValueError, match=re.escape(message)):
+        pxrd_tools.analyze.apply_diffractogram_corrections(
+            _TWO_THETA_VALID, _INTENSITY_VALID, **kwargs
+        )
+
+
+@pytest.mark.parametrize("kwargs, message", _INVALID_PEAK_DETECTION_PARAMETERS)
+def test_find_peaks_parameter_arg_checks(kwargs, message):
+    """
+    Test checks of invalid peak detection parameters for `find_peaks()`.
+    """
+    with pytest.raises(ValueError, match=re.escape(message)):
+        pxrd_tools.analyze.find_peaks(_TWO_THETA_VALID, _INTENSITY_VALID, **kwargs)
@@ -0,0 +1,167 @@
+"""
+Unit tests for `pxrd_tools.cli` package
+"""
+# --- Imports
+
+# Standard library
+import os
+import shutil
+import tempfile
+import unittest
+
+# External packages
+from typer.testing import CliRunner
+
+# Local packages/modules
+from pxrd_tools.cli import app
+
+
+# --- Test Suites
+
+
+class test_pxrd_tools_cli(unittest.TestCase):
+    """
+    Test suite for the `pxrd_tools.cli` package
+    """
+
+    # --- Fixtures
+
+    def setUp(self):
+        """
+        Prepare for test.
+        """
+        self.test_data_dir = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "data")
+        )
+
+    def tearDown(self):
+        """
+        Clean up after test.
+        """
+
+    # --- Tests
+
+    def test_peaks(self):
+        """
+        Test `peaks` command.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # --- Preparations
+
+            runner = CliRunner()
+            log_file = os.path.join(tmp_dir, "pxrd-tools.log")
+            data_file = os.path.join(self.test_data_dir, "zircon.prn")
+
+            # --- Exercise functionality
+
+            result = runner.invoke(app, ["--log-file", log_file, "peaks", data_file])
+
+            # --- Check results
+
+            assert result.exit_code == 0
+            lines = result.stdout.splitlines()
+            assert len(lines) == 75
+            for line in lines:
+                peak, peak_width = (float(value) for value in line.split(","))
+                assert peak > 0
+                assert peak_width > 0
+
+    def test_peaks_batch(self):
+        """
+        Test `peaks-batch` command.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # --- Preparations
+
+            # Data directory containing data files and files that are not data files
+            data_dir = os.path.join(tmp_dir, "data")
+            os.mkdir(data_dir)
+            for data_file in ["test-data.csv", "zircon.prn"]:
+                shutil.copy(os.path.join(self.test_data_dir, data_file), data_dir)
+
+            with open(os.path.join(data_dir, "pxrd-tools.log"), "w") as file_:
+                file_.write("[2024-01-01 00:00:00,000]:[cli]:message\n")
+
+            runner = CliRunner()
+            log_file = os.path.join(tmp_dir, "pxrd-tools.log")
+
+            # --- Exercise functionality and check results
+
+            # Files that are not data files are skipped by default
+            result = runner.invoke(
+                app, ["--log-file", log_file, "peaks-batch", data_dir, "-j", "2"]
+            )
+
+            assert result.exit_code == 0
+            data_files = [line.split(",")[0] for line in result.stdout.splitlines()]
+            assert sorted(set(data_files)) == [
+                os.path.join(data_dir, "test-data.csv"),
+                os.path.join(data_dir, "zircon.prn"),
+            ]
+            assert data_files.count(os.path.join(data_dir, "zircon.prn")) == 75
+
+            # Invalid data files are reported and the other data files are processed
+            with open(os.path.join(data_dir, "invalid.csv"), "w") as file_:
+                file_.write("not,data\n")
+
+            result = runner.invoke(
+                app, ["--log-file", log_file, "peaks-batch", data_dir, "-j", "2"]
+            )
+
+            assert result.exit_code == 1
+            assert "invalid.csv" in result.stderr
+            data_files = [line.split(",")[0] for line in result.stdout.splitlines()]
+            assert sorted(set(data_files)) == [
+                os.path.join(data_dir, "test-data.csv"),
+                os.path.join(data_dir, "zircon.prn"),
+            ]
+
+    def test_peaks_batch_arg_checks(self):
+        """
+        Test argument checks for `peaks-batch` command.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # --- Preparations
+
+            data_dir = os.path.join(tmp_dir, "data")
+            os.mkdir(data_dir)
+            shutil.copy(os.path.join(self.test_data_dir, "zircon.prn"), data_dir)
+
+            runner = CliRunner()
+            log_file = os.path.join(tmp_dir, "pxrd-tools.log")
+
+            # --- Exercise functionality and check results
+
+            # max_workers is not positive
+            for max_workers in ["0", "-2"]:
+                result = runner.invoke(
+                    app,
+                    [
+                        "--log-file",
+                        log_file,
+                        "peaks-batch",
+                        data_dir,
+                        "-j",
+                        max_workers,
+                    ],
+                )
+
+                assert result.exit_code == 2
+                assert "Invalid value for '--max-workers'" in result.stderr
+
+            # data file pattern is absolute
+            result = runner.invoke(
+                app,
+                [
+                    "--log-file",
+                    log_file,
+                    "peaks-batch",
+                    data_dir,
+                    "--pattern",
+                    os.path.join(data_dir, "*.prn"),
+                ],
+            )
+
+            assert result.exit_code == 2
+            assert "Invalid value for '--pattern'" in result.stderr
+            assert result.stdout == ""
@@ -6,9 +6,12 @@ Unit tests for `pxrd_tools.io` module
 # Standard library
 import os
 from pathlib import Path
+import re
+import tempfile
 import unittest
 
 # External packages
+import numpy as np
 from pandas import DataFrame
 import pytest
 
@@ -41,6 +44,58 @@ class test_pxrd_tools_io(unittest.TestCase):
 
     # --- Tests
 
+    @staticmethod
+    def test_read_pxrd_arg_checks():
+        """
+        Test argument checks for `read_pxrd()`.
+        """
+        # --- Exercise functionality and check results
+
+        path = "invalid/path"
+
+        with pytest.raises(
+            ValueError, match=re.escape(f"Data file '{path}' not found")
+        ):
+            pxrd_tools.io.read_pxrd(path)
+
+    def test_read_pxrd(self):
+        """
+        Test `read_pxrd()`.
+        """
+        # --- Exercise functionality and check results
+
+        for filename, delimiter in [
+            ("test-data.csv", None),
+            ("test-data.prn", r"\s+"),
+        ]:
+            # ------ path is a str
+
+            path = os.path.join(self.test_data_dir, filename)
+            two_theta, count = pxrd_tools.io.read_pxrd(path, delimiter=delimiter)
+
+            # Check results
+            for values in [two_theta, count]:
+                assert isinstance(values, np.ndarray)
+                assert values.dtype == np.float64
+                assert values.flags.c_contiguous
+                assert len(values) == 7251
+                assert not np.isnan(values).any()
+
+            assert two_theta[0] == 5.0
+            assert count[0] == 169
+
+            # ------ path is a Path
+
+            path = Path(os.path.join(self.test_data_dir, filename))
+            assert isinstance(path, Path)
+            two_theta_path, count_path = pxrd_tools.io.read_pxrd(
+                path, delimiter=delimiter
+            )
+
+            # Check results
+            np.testing.assert_array_equal(two_theta_path, two_theta)
+            np.testing.assert_array_equal(count_path, count)
+
     @staticmethod
     def test_read_csv_arg_checks():
         """
@@ -50,11 +105,11 @@ class test_pxrd_tools_io(unittest.TestCase):
 
         path = "invalid/path"
 
-        with pytest.raises(ValueError) as exception_info:
+        with pytest.raises(
+            ValueError, match=re.escape(f"Data file '{path}' not found")
+        ):
             pxrd_tools.io.read_csv(path)
 
-        assert f"Data file '{path}' not found" in str(exception_info)
-
     def test_read_csv(self):
         """
         Test `read_csv()`.
@@ -69,6 +124,7 @@ class test_pxrd_tools_io(unittest.TestCase):
         # Check results
         assert isinstance(data, DataFrame)
         assert list(data.columns) == pxrd_tools.io._PXRD_DATAFRAME_COLUMNS
+        assert all(data.dtypes == np.float64)
         assert len(data) == 7251
         assert data.isna().sum().sum() == 0
 
@@ -81,9 +137,88 @@ class test_pxrd_tools_io(unittest.TestCase):
         # Check results
         assert isinstance(data, DataFrame)
         assert list(data.columns) == pxrd_tools.io._PXRD_DATAFRAME_COLUMNS
+        assert all(data.dtypes == np.float64)
         assert len(data) == 7251
         assert data.isna().sum().sum() == 0
 
+    @staticmethod
+    def test_read_pxrd_cache():
+        """
+        Test caching of parsed data by `read_pxrd()`.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # --- Preparations
+
+            path = os.path.join(tmp_dir, "data.csv")
+            with open(path, "w") as file_:
+                file_.write("5.000,169\n5.020,174\n5.040,187\n")
+
+            pxrd_tools.io.clear_cache()
+
+            # --- Exercise functionality and check results
+
+            # Repeated reads of an unchanged data file use the cached data
+            two_theta, count = pxrd_tools.io.read_pxrd(path)
+            cache_info = pxrd_tools.io._read_pxrd_data.cache_info()
+            assert (cache_info.hits, cache_info.misses) == (0, 1)
+
+            two_theta, count = pxrd_tools.io.read_pxrd(path)
+            cache_info = pxrd_tools.io._read_pxrd_data.cache_info()
+            assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+            # Modifying returned arrays does not modify cached data
+            count[:] = 0
+
+            two_theta, count = pxrd_tools.io.read_pxrd(path)
+            np.testing.assert_array_equal(count, [169, 174, 187])
+            assert count.flags["WRITEABLE"]
+            cache_info = pxrd_tools.io._read_pxrd_data.cache_info()
+            assert (cache_info.hits, cache_info.misses) == (2, 1)
+
+            # Data files with a modified size are re-parsed
+            with open(path, "w") as file_:
+                file_.write("5.000,169\n5.020,174\n5.040,187\n5.060,200\n")
+
+            two_theta, count = pxrd_tools.io.read_pxrd(path)
+            np.testing.assert_array_equal(count, [169, 174, 187, 200])
+            cache_info = pxrd_tools.io._read_pxrd_data.cache_info()
+            assert (cache_info.hits, cache_info.misses) == (2, 2)
+
+            # Data files with the same size and a modified modification time are
+            # re-parsed
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "w") as file_:
+                file_.write("5.000,169\n5.020,174\n5.040,187\n5.060,300\n")
+            os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+            two_theta, count = pxrd_tools.io.read_pxrd(path)
+            np.testing.assert_array_equal(count, [169, 174, 187, 300])
+            cache_info = pxrd_tools.io._read_pxrd_data.cache_info()
+            assert (cache_info.hits, cache_info.misses) == (2, 3)
+
+    @staticmethod
+    def test_read_csv_missing_values():
+        """
+        Test `read_csv()` for data files with missing values.
+        """
+        # --- Preparations
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "missing-values.csv")
+            with open(path, "w") as file_:
+                file_.write("5.000,169\n5.020,\n5.040,187\n")
+
+            # --- Exercise functionality
+
+            data = pxrd_tools.io.read_csv(path)
+
+        # --- Check results
+
+        assert isinstance(data, DataFrame)
+        assert list(data.columns) == pxrd_tools.io._PXRD_DATAFRAME_COLUMNS
+        assert len(data) == 3
+        assert data["count"].isna().sum() == 1
+
     @staticmethod
     def test_read_prn_arg_checks():
         """
@@ -93,11 +228,11 @@ class test_pxrd_tools_io(unittest.TestCase):
 
         path = "invalid/path"
 
-        with pytest.raises(ValueError) as exception_info:
+        with pytest.raises(
+            ValueError, match=re.escape(f"Data file '{path}' not found")
+        ):
             pxrd_tools.io.read_prn(path)
 
-        assert f"Data file '{path}' not found" in str(exception_info)
-
     def test_read_prn(self):
         """
         Test `read_prn()`.
@@ -112,6 +247,7 @@ class test_pxrd_tools_io(unittest.TestCase):
         # Check results
         assert isinstance(data, DataFrame)
         assert list(data.columns) == pxrd_tools.io._PXRD_DATAFRAME_COLUMNS
+        assert all(data.dtypes == np.float64)
         assert len(data) == 7251
         assert data.isna().sum().sum() == 0
 
@@ -124,5 +260,6 @@ class test_pxrd_tools_io(unittest.TestCase):
         # Check results
         assert isinstance(data, DataFrame)
         assert list(data.columns) == pxrd_tools.io._PXRD_DATAFRAME_COLUMNS
+        assert all(data.dtypes == np.float64)
         assert len(data) == 7251
         assert data.isna().sum().sum() == 0